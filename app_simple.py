@@ -1,10 +1,12 @@
 import streamlit as st
-import pandas as pd
-st.warning("Educational simulation only. Not official financial reporting. Use for learning and discussion.")
-st.caption("v0.1 (testing)")
+import numpy as np
+import metrics_engine
 
 st.set_page_config(page_title="Plant Margin Simulator", layout="wide")
 
+st.warning("Educational simulation only. Not official financial reporting. Use for learning and discussion.")
+st.caption("v0.1 (testing)")
+
 # ======================================================
 # Fixed Baseline (edit once here)
 # ======================================================
@@ -24,83 +26,38 @@ BASELINE = {
 # ======================================================
 # Helpers
 # ======================================================
-def clamp(x, lo=0.0, hi=1.0):
-    return max(lo, min(hi, x))
-
-def money0(x):
-    return f"${x:,.0f}"
+money0 = "${:,.0f}".format
+money2 = "${:,.2f}".format
+_PCT = "{:.2f}%".format
+_PTS = "{:.2f} pts".format
+_INT = "{:,.0f}".format
 
-def money2(x):
-    return f"${x:,.2f}"
+# Indexed by sign(delta) + 1; int() keeps this valid for NumPy scalars too
+_ARROWS = ("▼", "●", "▲")
+_CLASSES = ("neg", "neu", "pos")
 
 def arrow(delta, tol=1e-9):
-    if delta > tol:
-        return "▲"
-    if delta < -tol:
-        return "▼"
-    return "●"
+    return _ARROWS[int(delta > tol) - int(delta < -tol) + 1]
 
 def delta_class(delta, tol=1e-9):
-    if delta > tol:
-        return "pos"
-    if delta < -tol:
-        return "neg"
-    return "neu"
+    return _CLASSES[int(delta > tol) - int(delta < -tol) + 1]
 
 def value_class(val):
-    # EBITDA value: black if positive, red if negative
+    # EBITDA value: theme text colour if positive, red if negative
     return "neutral" if val > 0 else "neg"
 
+_SPAN = {klass: f"<span class='{klass}'>{{}}</span>".format for klass in _CLASSES}
+
 def colorize(text, delta):
-    return f"<span class='{delta_class(delta)}'>{text}</span>"
+    return _SPAN[delta_class(delta)](text)
 
 # ======================================================
-# Core Financial Engine (names match BASELINE keys)
+# Core Financial Engine (see metrics_engine.py)
 # ======================================================
-def compute_metrics(
-    price_per_ton: float,
-    run_rate_tph: float,
-    planned_hours_per_month: float,
-    downtime_hours: float,
-    yield_pct: float,
-    energy_cost_per_ton: float,
-    labor_cost_per_ton: float,
-    scrap_pct: float,
-    other_variable_cost_per_ton: float,
-    fixed_cost_per_month: float,
-):
-    downtime_hours = max(0.0, min(downtime_hours, planned_hours_per_month))
-    operating_hours = planned_hours_per_month - downtime_hours
-    tons_processed = run_rate_tph * operating_hours
-
-    yield_frac = clamp(yield_pct / 100.0, 0.50, 1.00)
-    scrap_frac = clamp(scrap_pct / 100.0, 0.0, 0.20)
-
-    saleable_tons = tons_processed * yield_frac
-    net_saleable_tons = saleable_tons * (1.0 - scrap_frac)
-
-    revenue = net_saleable_tons * price_per_ton
-    variable_cost = tons_processed * (
-        energy_cost_per_ton + labor_cost_per_ton + other_variable_cost_per_ton
-    )
+compute_metrics = st.cache_data(max_entries=256)(metrics_engine.compute_metrics)
 
-    contribution = revenue - variable_cost
-    ebitda = contribution - fixed_cost_per_month
-
-    return {
-        "Operating hours": operating_hours,
-        "Tons processed": tons_processed,
-        "Net saleable tons": net_saleable_tons,
-        "Revenue": revenue,
-        "Variable cost": variable_cost,
-        "Contribution": contribution,
-        "Contribution %": (contribution / revenue) * 100 if revenue else 0,
-        "Fixed cost": fixed_cost_per_month,
-        "EBITDA": ebitda,
-        "EBITDA %": (ebitda / revenue) * 100 if revenue else 0,
-        "Var cost / processed ton": (variable_cost / tons_processed) if tons_processed else 0,
-        "Contribution / processed ton": (contribution / tons_processed) if tons_processed else 0,
-    }
+# Memoized by the cache_data layer, whose key covers the engine source and inputs
+BASELINE_METRICS = compute_metrics(**BASELINE)
 
 # ======================================================
 # Session State Defaults (Reset)
@@ -125,7 +82,6 @@ for k, v in DEFAULTS.items():
 def reset_to_baseline():
     for k, v in DEFAULTS.items():
         st.session_state[k] = v
-    st.rerun()
 
 # ======================================================
 # Page Title
@@ -164,34 +120,37 @@ with st.sidebar:
 # ======================================================
 # Compute baseline and current
 # ======================================================
-baseline = compute_metrics(**BASELINE)
-
-current_inputs = {
-    "price_per_ton": float(price_per_ton),
-    "run_rate_tph": float(run_rate_tph),
-    "planned_hours_per_month": float(planned_hours_per_month),
-    "downtime_hours": float(downtime_hours),
-    "yield_pct": float(yield_pct),
-    "energy_cost_per_ton": float(energy_cost_per_ton),
-    "labor_cost_per_ton": float(labor_cost_per_ton),
-    "scrap_pct": float(scrap_pct),
-    "other_variable_cost_per_ton": float(other_variable_cost_per_ton),
-    "fixed_cost_per_month": float(fixed_cost_per_month),
-}
-current = compute_metrics(**current_inputs)
+baseline = BASELINE_METRICS
+
+# Positional order matches the compute_metrics signature
+current_inputs = np.array([
+    price_per_ton,
+    run_rate_tph,
+    planned_hours_per_month,
+    downtime_hours,
+    yield_pct,
+    energy_cost_per_ton,
+    labor_cost_per_ton,
+    scrap_pct,
+    other_variable_cost_per_ton,
+    fixed_cost_per_month,
+], dtype=np.float64)
+current = compute_metrics(*current_inputs)
 
 delta_ebitda = current["EBITDA"] - baseline["EBITDA"]
 
 # ======================================================
 # CSS
 # ======================================================
-st.markdown("""
+_CSS_HTML = """
 <style>
 .pos { color: #22c55e; font-weight: 800; }
 .neg { color: #ef4444; font-weight: 800; }
-.neutral { color: #000000; font-weight: 900; }
+.neutral { color: inherit; font-weight: 900; }
 .neu { color: #9ca3af; font-weight: 700; }
 
+.kpi-row { display: flex; flex-wrap: wrap; gap: 24px; }
+.kpi-row .kpi-card { flex: 1; min-width: 200px; }
 .kpi-card { padding: 6px 0px; }
 .kpi-label { font-size: 14px; color: #9ca3af; margin-bottom: 4px; }
 .kpi-value { font-size: 2rem; font-weight: 600; }
@@ -214,37 +173,44 @@ st.markdown("""
   border-bottom: 1px solid rgba(255,255,255,0.08);
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS_HTML, unsafe_allow_html=True)
 
 # ======================================================
 # Top KPIs (Baseline, Current, Delta)
 # ======================================================
-k1, k2, k3 = st.columns(3)
-
-k1.metric("Baseline EBITDA", money0(baseline["EBITDA"]))
-
-k2.markdown(
-    f"""
-    <div class="kpi-card">
-        <div class="kpi-label">Current EBITDA</div>
-        <div class="kpi-value {value_class(current['EBITDA'])}">
-            {money0(current['EBITDA'])}
-            <span class="{delta_class(delta_ebitda)}">{arrow(delta_ebitda)}</span>
-        </div>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
+_KPI_CARD_HTML = (
+    '<div class="kpi-card">'
+    '<div class="kpi-label">{label}</div>'
+    '<div class="{classes}">{value}</div>'
+    '</div>'
+).format
+
+_KPI_ARROW_HTML = '{value} <span class="{klass}">{arrow}</span>'.format
 
-k3.markdown(
-    f"""
-    <div class="kpi-card">
-        <div class="kpi-label">Δ EBITDA vs Baseline</div>
-        <div class="kpi-value {delta_class(delta_ebitda)}">
-            {money0(delta_ebitda)}
-        </div>
-    </div>
-    """,
+st.markdown(
+    '<div class="kpi-row">'
+    + _KPI_CARD_HTML(
+        label="Baseline EBITDA",
+        classes="kpi-value",
+        value=money0(baseline["EBITDA"]),
+    )
+    + _KPI_CARD_HTML(
+        label="Current EBITDA",
+        classes=f"kpi-value {value_class(current['EBITDA'])}",
+        value=_KPI_ARROW_HTML(
+            value=money0(current["EBITDA"]),
+            klass=delta_class(delta_ebitda),
+            arrow=arrow(delta_ebitda),
+        ),
+    )
+    + _KPI_CARD_HTML(
+        label="Δ EBITDA vs Baseline",
+        classes=f"kpi-value {delta_class(delta_ebitda)}",
+        value=money0(delta_ebitda),
+    )
+    + "</div>",
     unsafe_allow_html=True,
 )
 
@@ -285,86 +251,70 @@ GROUPS = {
     ],
 }
 
-rows = []
+METRIC_ORDER = [m for metrics in GROUPS.values() for m in metrics]
 
-for group, metrics in GROUPS.items():
-    rows.append({"Metric": f"<b>{group}</b>", "Baseline": "", "Current": "", "Delta": ""})
-
-    for m in metrics:
-        b = baseline[m]
-        c = current[m]
-        d = c - b
-
-        if m in ["Contribution %", "EBITDA %"]:
-            base_str = f"{b:.2f}%"
-            curr_str = f"{c:.2f}%"
-            delta_str = f"{d:.2f} pts"
-        elif m in ["Var cost / processed ton", "Contribution / processed ton"]:
-            base_str = money2(b)
-            curr_str = money2(c)
-            delta_str = money2(d)
-        elif m in ["Operating hours", "Tons processed", "Net saleable tons"]:
-            base_str = f"{b:,.0f}"
-            curr_str = f"{c:,.0f}"
-            delta_str = f"{d:,.0f}"
-        else:
-            base_str = money0(b)
-            curr_str = money0(c)
-            delta_str = money0(d)
+_TABLE_HEAD = (
+    "<div class='big-table'><table border='1' class='dataframe'>"
+    "<thead><tr><th>Metric</th><th>Baseline</th><th>Current</th><th>Delta</th></tr></thead>"
+    "<tbody>"
+)
+_TABLE_FOOT = "</tbody></table></div>"
+_ROW = "<tr><td>{0}</td><td>{1}</td><td>{2}</td><td>{3}</td></tr>".format
+
+# (baseline, current, delta) formatters per metric; anything else is money0
+DEFAULT_FMT = (money0, money0, money0)
+FMT = {
+    **dict.fromkeys(("Contribution %", "EBITDA %"), (_PCT, _PCT, _PTS)),
+    **dict.fromkeys(("Var cost / processed ton", "Contribution / processed ton"), (money2, money2, money2)),
+    **dict.fromkeys(("Operating hours", "Tons processed", "Net saleable tons"), (_INT, _INT, _INT)),
+}
 
+# Group header rows and Baseline column cells, built once per process.
+# cache_resource keys only on this function's source and arguments, so every
+# input is passed in (or written out here) to keep edits from going stale.
+@st.cache_resource
+def _baseline_table_parts(baseline_metrics, base_specs, formulas, groups, row_template):
+    header_rows = {group: row_template.format(f"<b>{group}</b>", "", "", "") for group in groups}
+    cells = {}
+    for metric, spec in base_specs.items():
+        cell = spec.format(baseline_metrics[metric])
         # Baseline cell includes formula (if defined)
-        if m in FORMULAS:
-            baseline_display = (
-                f"{base_str}"
+        if metric in formulas:
+            cell += (
                 f"<div style='font-size:12px; color:#9ca3af; margin-top:4px;'>"
-                f"({m} = {FORMULAS[m]})"
+                f"({metric} = {formulas[metric]})"
                 f"</div>"
             )
-        else:
-            baseline_display = base_str
-
-        rows.append({
-            "Metric": m,
-            "Baseline": baseline_display,
-            "Current": colorize(f"{curr_str} {arrow(d)}", d),
-            "Delta": colorize(delta_str, d),
-        })
+        cells[metric] = cell
+    return header_rows, cells
+
+GROUP_HEADER_ROWS, BASELINE_CELLS = _baseline_table_parts(
+    BASELINE_METRICS,
+    # Format strings behind the bound baseline formatters in FMT
+    {m: FMT.get(m, DEFAULT_FMT)[0].__self__ for m in METRIC_ORDER},
+    FORMULAS,
+    tuple(GROUPS),
+    _ROW.__self__,
+)
 
+html_rows = []
+for group, metrics in GROUPS.items():
+    html_rows.append(GROUP_HEADER_ROWS[group])
 
     for m in metrics:
-        b = baseline[m]
         c = current[m]
-        d = c - b
-
-        if m in ["Contribution %", "EBITDA %"]:
-            base_str = f"{b:.2f}%"
-            curr_str = f"{c:.2f}%"
-            delta_str = f"{d:.2f} pts"
-        elif m in ["Var cost / processed ton", "Contribution / processed ton"]:
-            base_str = money2(b)
-            curr_str = money2(c)
-            delta_str = money2(d)
-        elif m in ["Operating hours", "Tons processed", "Net saleable tons"]:
-            base_str = f"{b:,.0f}"
-            curr_str = f"{c:,.0f}"
-            delta_str = f"{d:,.0f}"
-        else:
-            base_str = money0(b)
-            curr_str = money0(c)
-            delta_str = money0(d)
-
-        rows.append({
-            "Metric": m,
-            "Baseline": base_str,
-            "Current": colorize(f"{curr_str} {arrow(d)}", d),
-            "Delta": colorize(delta_str, d),
-        })
-
-df = pd.DataFrame(rows)
+        d = c - baseline[m]
+        _, c_fmt, d_fmt = FMT.get(m, DEFAULT_FMT)
+        html_rows.append(_ROW(
+            m,
+            BASELINE_CELLS[m],
+            colorize(f"{c_fmt(c)} {arrow(d)}", d),
+            colorize(d_fmt(d), d),
+        ))
 
 st.subheader("Baseline vs Current vs Delta")
 st.markdown(
-    "<div class='big-table'>" + df.to_html(index=False, escape=False) + "</div>",
+    _TABLE_HEAD + "".join(html_rows) + _TABLE_FOOT,
     unsafe_allow_html=True,
 )
 
@@ -0,0 +1,108 @@
+import numpy as np
+
+# ======================================================
+# Helpers
+# ======================================================
+def safe_div(num, den):
+    # Elementwise num / den, 0 where den is 0 (works for scalars and arrays);
+    # [()] turns the 0-d result of a scalar call back into a NumPy scalar
+    nonzero = den != 0
+    return np.where(nonzero, num / np.where(nonzero, den, 1.0), 0.0)[()]
+
+# ======================================================
+# Core Financial Engine (names match BASELINE keys in app_simple.py)
+# Inputs may be scalars or equal-length NumPy arrays (scenario sweeps)
+# ======================================================
+METRIC_NAMES = (
+    "Operating hours",
+    "Tons processed",
+    "Net saleable tons",
+    "Revenue",
+    "Variable cost",
+    "Contribution",
+    "Contribution %",
+    "Fixed cost",
+    "EBITDA",
+    "EBITDA %",
+    "Var cost / processed ton",
+    "Contribution / processed ton",
+)
+
+def compute_metrics(
+    price_per_ton: float,
+    run_rate_tph: float,
+    planned_hours_per_month: float,
+    downtime_hours: float,
+    yield_pct: float,
+    energy_cost_per_ton: float,
+    labor_cost_per_ton: float,
+    scrap_pct: float,
+    other_variable_cost_per_ton: float,
+    fixed_cost_per_month: float,
+):
+    downtime_hours = np.minimum(np.maximum(downtime_hours, 0.0), planned_hours_per_month)
+    operating_hours = planned_hours_per_month - downtime_hours
+    tons_processed = run_rate_tph * operating_hours
+
+    yield_frac = np.clip(yield_pct / 100.0, 0.50, 1.00)
+    scrap_frac = np.clip(scrap_pct / 100.0, 0.0, 0.20)
+
+    # Per-ton factors are computed once so the per-ton metrics need no division
+    net_yield = yield_frac * (1.0 - scrap_frac)
+    var_per_ton = energy_cost_per_ton + labor_cost_per_ton + other_variable_cost_per_ton
+    has_tons = tons_processed != 0
+
+    net_saleable_tons = tons_processed * net_yield
+    revenue = net_saleable_tons * price_per_ton
+    variable_cost = tons_processed * var_per_ton
+
+    contribution = revenue - variable_cost
+    ebitda = contribution - fixed_cost_per_month
+
+    return {
+        "Operating hours": operating_hours,
+        "Tons processed": tons_processed,
+        "Net saleable tons": net_saleable_tons,
+        "Revenue": revenue,
+        "Variable cost": variable_cost,
+        "Contribution": contribution,
+        "Contribution %": safe_div(contribution, revenue) * 100,
+        "Fixed cost": fixed_cost_per_month,
+        "EBITDA": ebitda,
+        "EBITDA %": safe_div(ebitda, revenue) * 100,
+        "Var cost / processed ton": np.where(has_tons, var_per_ton, 0.0)[()],
+        "Contribution / processed ton": np.where(has_tons, net_yield * price_per_ton - var_per_ton, 0.0)[()],
+    }
+
+
+# ======================================================
+# Scenario Sweeps (numba kernel in metrics_kernel.py when available)
+# ======================================================
+def compute_metrics_sweep(
+    price_per_ton,
+    run_rate_tph,
+    planned_hours_per_month,
+    downtime_hours,
+    yield_pct,
+    energy_cost_per_ton,
+    labor_cost_per_ton,
+    scrap_pct,
+    other_variable_cost_per_ton,
+    fixed_cost_per_month,
+):
+    # Batch compute_metrics over many scenarios; inputs broadcast to one shape
+    arrays = [
+        np.ravel(np.asarray(x, dtype=np.float64)) for x in (
+            price_per_ton, run_rate_tph, planned_hours_per_month, downtime_hours, yield_pct,
+            energy_cost_per_ton, labor_cost_per_ton, scrap_pct, other_variable_cost_per_ton,
+            fixed_cost_per_month,
+        )
+    ]
+    # Materialize broadcast views so the kernel gets plain contiguous arrays
+    shape = np.broadcast_shapes(*(a.shape for a in arrays))
+    inputs = [np.ascontiguousarray(np.broadcast_to(a, shape)) for a in arrays]
+    try:
+        from metrics_kernel import compute_metrics_sweep_kernel
+    except ImportError:  # numba is optional; fall back to the NumPy engine
+        return compute_metrics(*inputs)
+    return dict(zip(METRIC_NAMES, compute_metrics_sweep_kernel(*inputs)))
@@ -0,0 +1,59 @@
+import numpy as np
+from numba import njit, prange
+
+from metrics_engine import METRIC_NAMES
+
+# ======================================================
+# Scalar kernel (mirrors compute_metrics in metrics_engine.py)
+# Imported lazily by compute_metrics_sweep; numba is optional
+# ======================================================
+N_METRICS = len(METRIC_NAMES)
+
+@njit(cache=True, fastmath=True)
+def compute_metrics_kernel(price, tph, hrs, dt, yld, energy, labor, scrap, other, fixed):
+    dt = min(max(dt, 0.0), hrs)
+    operating_hours = hrs - dt
+    tons_processed = tph * operating_hours
+
+    yield_frac = min(max(yld / 100.0, 0.50), 1.00)
+    scrap_frac = min(max(scrap / 100.0, 0.0), 0.20)
+    net_yield = yield_frac * (1.0 - scrap_frac)
+    var_per_ton = energy + labor + other
+
+    net_saleable_tons = tons_processed * net_yield
+    revenue = net_saleable_tons * price
+    variable_cost = tons_processed * var_per_ton
+    contribution = revenue - variable_cost
+    ebitda = contribution - fixed
+
+    contribution_pct = 0.0
+    ebitda_pct = 0.0
+    if revenue != 0:
+        contribution_pct = contribution / revenue * 100
+        ebitda_pct = ebitda / revenue * 100
+    contribution_per_ton = 0.0
+    if tons_processed != 0:
+        contribution_per_ton = net_yield * price - var_per_ton
+    else:
+        var_per_ton = 0.0
+
+    return (
+        operating_hours, tons_processed, net_saleable_tons, revenue, variable_cost,
+        contribution, contribution_pct, fixed, ebitda, ebitda_pct,
+        var_per_ton, contribution_per_ton,
+    )
+
+# ======================================================
+# Batch sweep (one row per metric, one column per scenario)
+# ======================================================
+@njit(cache=True, parallel=True)
+def compute_metrics_sweep_kernel(price, tph, hrs, dt, yld, energy, labor, scrap, other, fixed):
+    n = price.shape[0]
+    out = np.empty((N_METRICS, n))
+    for i in prange(n):
+        row = compute_metrics_kernel(
+            price[i], tph[i], hrs[i], dt[i], yld[i], energy[i], labor[i], scrap[i], other[i], fixed[i]
+        )
+        for j in range(N_METRICS):
+            out[j, i] = row[j]
+    return out
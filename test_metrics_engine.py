@@ -0,0 +1,63 @@
+import sys
+
+import numpy as np
+import pytest
+
+from metrics_engine import METRIC_NAMES, compute_metrics, compute_metrics_sweep
+
+
+def _random_scenarios(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    inputs = [
+        rng.uniform(200, 1200, n),    # price_per_ton
+        rng.uniform(20, 400, n),      # run_rate_tph
+        rng.uniform(200, 744, n),     # planned_hours_per_month
+        rng.uniform(-10, 800, n),     # downtime_hours (exercises the clamp)
+        rng.uniform(40, 110, n),      # yield_pct (exercises the clip)
+        rng.uniform(0, 200, n),       # energy_cost_per_ton
+        rng.uniform(0, 200, n),       # labor_cost_per_ton
+        rng.uniform(0, 30, n),        # scrap_pct (exercises the clip)
+        rng.uniform(0, 400, n),       # other_variable_cost_per_ton
+        rng.uniform(0, 2e7, n),       # fixed_cost_per_month
+    ]
+    inputs[1][:5] = 0.0  # zero tons processed -> ratio metrics fall back to 0
+    return inputs
+
+
+def _assert_matches_engine(result, inputs):
+    expected = compute_metrics(*inputs)
+    assert tuple(result) == METRIC_NAMES
+    for name in METRIC_NAMES:
+        np.testing.assert_allclose(
+            result[name], np.broadcast_to(expected[name], result[name].shape),
+            rtol=1e-9, atol=1e-6, err_msg=name,
+        )
+
+
+def test_compute_metrics_keys_follow_metric_names():
+    assert tuple(compute_metrics(500.0, 120.0, 600.0, 40.0, 95.0, 35.0, 25.0, 1.0, 60.0, 2e6)) == METRIC_NAMES
+
+
+def test_compute_metrics_scalar_call_returns_scalars():
+    metrics = compute_metrics(500.0, 120.0, 600.0, 40.0, 95.0, 35.0, 25.0, 1.0, 60.0, 2e6)
+    assert not any(isinstance(v, np.ndarray) for v in metrics.values())
+
+
+def test_sweep_matches_engine_with_numba():
+    pytest.importorskip("numba")
+    inputs = _random_scenarios()
+    _assert_matches_engine(compute_metrics_sweep(*inputs), inputs)
+
+
+def test_sweep_matches_engine_without_numba(monkeypatch):
+    monkeypatch.setitem(sys.modules, "metrics_kernel", None)
+    inputs = _random_scenarios()
+    _assert_matches_engine(compute_metrics_sweep(*inputs), inputs)
+
+
+def test_sweep_broadcasts_scalar_inputs():
+    downtime = np.arange(0.0, 50.0)
+    result = compute_metrics_sweep(500, 120, 600, downtime, 95, 35, 25, 1, 60, 2e6)
+    assert result["EBITDA"].shape == downtime.shape
+    expected = compute_metrics(500.0, 120.0, 600.0, 40.0, 95.0, 35.0, 25.0, 1.0, 60.0, 2e6)
+    assert result["EBITDA"][40] == pytest.approx(expected["EBITDA"])